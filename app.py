@@ -1,37 +1,86 @@
 import math
 import os
+import sys
 import json
-from flask import Flask, request, jsonify, render_template, Response, send_from_directory
+from flask import Flask, request, jsonify, render_template, Response, send_from_directory, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_wtf.csrf import CSRFProtect
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
+from flask_compress import Compress
+from sqlalchemy import bindparam, delete, event, func, insert, inspect, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine
 from dotenv import load_dotenv
 import csv
 import io
+import sqlite3
+import threading
+import time
+from collections import defaultdict
 from datetime import datetime, timezone
-from functools import wraps
+from functools import lru_cache, wraps
+import msgpack
 import numpy as np
+import orjson
 from pyproj import Transformer
+from pyproj.enums import TransformDirection
 
 # --- CONFIG & INIT ---
 load_dotenv() 
 
 app = Flask(__name__)
 
+# Encode responses and parse request bodies (request.json) with orjson (Rust)
+# instead of the stdlib json module.
+# NaN/Inf become null, numpy scalars/arrays are handled natively.
+class OrjsonProvider(DefaultJSONProvider):
+    option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+app.json = OrjsonProvider(app)
+
 # Use the DATABASE_URL environment variable
 app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///pangolin_data.db') 
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-key-fallback')
 
 # ADD THESE THREE LINES TO PREVENT SSL CONNECTION ERRORS:
-app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
-    "pool_recycle": 280,   # Refreshes connection every 280 seconds
-    "pool_pre_ping": True, # Checks if connection is alive before using it
-}
+# (remote Postgres only -- local SQLite connections stay pooled with a warm
+# page cache instead of being pinged on every checkout and recycled)
+if not app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        "pool_recycle": 280,   # Refreshes connection every 280 seconds
+        "pool_pre_ping": True, # Checks if connection is alive before using it
+    }
+
+# Gzip the dashboard JSON and CSV exports (highly repetitive text)
+app.config['COMPRESS_MIMETYPES'] = ['application/json', 'text/csv']
+app.config['COMPRESS_LEVEL'] = 6
 
 db = SQLAlchemy(app)
 migrate = Migrate(app, db)
 csrf = CSRFProtect(app)
+Compress(app)
+
+# Local SQLite only: WAL + synchronous=NORMAL turns each commit into a single
+# append to the WAL instead of two fsyncs on the rollback journal.
+@event.listens_for(Engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.execute("PRAGMA cache_size=-20000")  # ~20MB page cache per connection
+        cursor.close()
 
 # Credentials (from .env)
 ADMIN_USERNAME = os.getenv('ADMIN_USERNAME', 'admin')
@@ -41,24 +90,29 @@ MAPBOX_TOKEN = os.getenv('MAPBOX_TOKEN', '')
 # --- MODELS ---
 class RawBearing(db.Model):
     __tablename__ = 'raw_bearings'
+    # Matches SELECT_GROUP_READINGS' (group_id, id) order, so the sync read
+    # needs no sort; group_id leads, so it serves plain group_id lookups too
+    __table_args__ = (
+        db.Index('ix_raw_bearings_group_id_id', 'group_id', 'id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
-    group_id = db.Column(db.String(80), index=True)
+    group_id = db.Column(db.String(80))
     pango_id = db.Column(db.String(10))
     observer = db.Column(db.String(10))
     obs_lat = db.Column(db.Float)
     obs_lon = db.Column(db.Float)
     bearing = db.Column(db.Float)
-    timestamp = db.Column(db.DateTime, default=datetime.utcnow)
+    timestamp = db.Column(db.DateTime, default=datetime.utcnow, index=True) # CSV export order
     gps_accuracy = db.Column(db.Float)
     
 class CalculatedFix(db.Model):
     __tablename__ = 'calculated_fixes'
     id = db.Column(db.Integer, primary_key=True)
-    group_id = db.Column(db.String(80), index=True)
+    group_id = db.Column(db.String(80), index=True, unique=True) # One fix per group (upsert target)
     pango_id = db.Column(db.String(10))
     calc_lat = db.Column(db.Float)
     calc_lon = db.Column(db.Float)
-    timestamp = db.Column(db.DateTime, default=datetime.utcnow)
+    timestamp = db.Column(db.DateTime, default=datetime.utcnow, index=True) # CSV export order
     note = db.Column(db.String(255))
     
 class Animal(db.Model):
@@ -66,26 +120,122 @@ class Animal(db.Model):
     id = db.Column(db.String(10), primary_key=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
-# Helper function to convert SQLAlchemy models to a serializable dictionary
-def to_dict(model):
-    data = {}
-    for column in model.__table__.columns:
-        value = getattr(model, column.name)
-        if isinstance(value, datetime):
-            data[column.name] = value.isoformat()
-        elif isinstance(value, float) and (math.isnan(value) or math.isinf(value)):
-            data[column.name] = None  # NaN/Inf are not valid JSON
-        else:
-            data[column.name] = value
-    return data
+# --- STATEMENTS ---
+# Built once so every request reuses the same constructs (and their cached
+# compiled SQL); IN lists bind through an expanding parameter.
+SELECT_GROUP_READINGS = (select(RawBearing.group_id, RawBearing.observer, RawBearing.timestamp,
+                                RawBearing.obs_lat, RawBearing.obs_lon, RawBearing.bearing, RawBearing.pango_id)
+                         .where(RawBearing.group_id.in_(bindparam('group_ids', expanding=True)))
+                         .order_by(RawBearing.group_id, RawBearing.id))
+SELECT_FIXED_GROUPS = (select(CalculatedFix.group_id)
+                       .where(CalculatedFix.group_id.in_(bindparam('group_ids', expanding=True))))
+INSERT_RAW_BEARINGS = insert(RawBearing)
+DELETE_GROUP_FIXES = (delete(CalculatedFix)
+                      .where(CalculatedFix.group_id.in_(bindparam('group_ids', expanding=True)))
+                      .execution_options(synchronize_session=False))
+INSERT_CALCULATED_FIXES = insert(CalculatedFix)
+
+def upsert_fixes_stmt(dialect_insert):
+    stmt = dialect_insert(CalculatedFix.__table__)
+    return stmt.on_conflict_do_update(
+        index_elements=['group_id'],
+        set_={col: stmt.excluded[col] for col in ('pango_id', 'calc_lat', 'calc_lon', 'timestamp', 'note')},
+    )
+
+# INSERT ... ON CONFLICT (group_id) DO UPDATE, keyed by dialect name
+UPSERT_CALCULATED_FIXES = {
+    'postgresql': upsert_fixes_stmt(pg_insert),
+    'sqlite': upsert_fixes_stmt(sqlite_insert),
+}
+
+# ON CONFLICT (group_id) needs the unique index from the migrations, which
+# db.create_all() never adds to an existing table ('flask db upgrade' does).
+# Checked once per process; None means replace fixes via delete + insert.
+@lru_cache(maxsize=None)
+def fixes_upsert_stmt():
+    indexes = inspect(db.engine).get_indexes('calculated_fixes')
+    if not any(ix['unique'] and ix['column_names'] == ['group_id'] for ix in indexes):
+        return None
+    return UPSERT_CALCULATED_FIXES.get(db.engine.dialect.name)
+SELECT_RAW_TABLE = select(*RawBearing.__table__.columns)
+SELECT_FIX_TABLE = select(*CalculatedFix.__table__.columns)
+COUNT_RAW = select(func.count()).select_from(RawBearing)
+COUNT_FIXES = select(func.count()).select_from(CalculatedFix)
+
+# CSV exports: column order of the file, oldest first
+RAW_CSV_FIELDS = ['id', 'group_id', 'pango_id', 'observer', 'obs_lat', 'obs_lon', 'bearing', 'timestamp', 'gps_accuracy']
+SELECT_RAW_CSV = select(*(RawBearing.__table__.c[f] for f in RAW_CSV_FIELDS)).order_by(RawBearing.timestamp)
+FIX_CSV_FIELDS = ['group_id', 'pango_id', 'calc_lat', 'calc_lon', 'timestamp', 'note']
+SELECT_FIX_CSV = select(*(CalculatedFix.__table__.c[f] for f in FIX_CSV_FIELDS)).order_by(CalculatedFix.timestamp)
+
+# Helper function to turn a result into a compact {columns, rows} table
+def to_columnar(result):
+    return {"columns": list(result.keys()), "rows": [tuple(row) for row in result]}
+
+# Python 3.11+ parses the 'Z' suffix natively; older versions need it rewritten
+if sys.version_info >= (3, 11):
+    _fromisoformat = datetime.fromisoformat
+else:
+    def _fromisoformat(value):
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+# Client timestamps are ISO strings (toISOString, 'Z' suffix); store them as
+# naive UTC, which is what the DateTime columns hand back on read
+def parse_client_time(value):
+    ts = _fromisoformat(value)
+    if ts.tzinfo is timezone.utc:
+        return ts.replace(tzinfo=None)
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts
 
 # --- MATH HELPERS ---
+# WGS84 -> UTM 44N is the same datum, so PROJ resolves it to a plain projection
+# (no grid shifts) and the way back is the same pipeline run in reverse.
 to_xy = Transformer.from_crs("EPSG:4326", "EPSG:32644", always_xy=True)
-to_ll = Transformer.from_crs("EPSG:32644", "EPSG:4326", always_xy=True)
 
-def bearing_to_unit_vector(b):
-    rad = np.deg2rad(b)
-    return np.array([np.sin(rad), np.cos(rad)])
+def triangulate_groups(lats, lons, brngs, group_idx, n_groups):
+    """
+    Least-squares bearing intersection for many groups in one vectorized pass.
+    group_idx maps each reading to its group (0..n_groups-1).
+    Returns: (lats, lons, error_metrics) arrays of length n_groups.
+    """
+    # One PROJ call for all observer positions
+    xs, ys = to_xy.transform(lons, lats)
+
+    rad = np.deg2rad(brngs)
+    dx, dy = np.sin(rad), np.cos(rad)
+    B = dy * xs - dx * ys
+
+    # Per-group 2x2 normal equations AᵀA·p = AᵀB, where each row of A is [dy, -dx]
+    def group_sum(w):
+        return np.bincount(group_idx, weights=w, minlength=n_groups)
+
+    m00, m01, m11 = group_sum(dy * dy), group_sum(-dx * dy), group_sum(dx * dx)
+    r0, r1 = group_sum(dy * B), group_sum(-dx * B)
+    det = m00 * m11 - m01 * m01
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sol_x = (m11 * r0 - m01 * r1) / det
+        sol_y = (-m01 * r0 + m00 * r1) / det
+
+    # Near-parallel bearings, let lstsq pick the minimum-norm solution
+    for g in np.flatnonzero(np.abs(det) < 1e-12):
+        mask = group_idx == g
+        A = np.column_stack([dy[mask], -dx[mask]])
+        sol_x[g], sol_y[g] = np.linalg.lstsq(A, B[mask], rcond=None)[0]
+
+    calc_lons, calc_lats = to_xy.transform(sol_x, sol_y, direction=TransformDirection.INVERSE)
+
+    # Calculate Confidence/Error
+    # Root Mean Square of Residuals (approximates avg error distance in meters)
+    # Computed directly, so rank-deficient groups (parallel/identical bearings)
+    # get their real miss distance rather than the 0 lstsq reported for them
+    resid = dy * sol_x[group_idx] - dx * sol_y[group_idx] - B
+    with np.errstate(divide='ignore', invalid='ignore'):
+        error_scores = np.sqrt(group_sum(resid * resid) / np.bincount(group_idx, minlength=n_groups))
+
+    return calc_lats, calc_lons, error_scores
 
 def perform_triangulation(readings):
     """
@@ -93,34 +243,10 @@ def perform_triangulation(readings):
     error_metric is the 'Residual Sum of Squares' root mean.
     """
     try:
-        points_xy = []
-        bearings = []
-        for r in readings:
-            lat, lon, brng = r
-            x, y = to_xy.transform(lon, lat)
-            points_xy.append((x, y))
-            bearings.append(brng)
-
-        A, B = [], []
-        for (x, y), b in zip(points_xy, bearings):
-            dx, dy = bearing_to_unit_vector(b)
-            A.append([dy, -dx])
-            B.append(dy * x - dx * y)
-            
-        A, B = np.array(A), np.array(B)
-        
-        # Least Squares Calculation
-        sol, residuals, rank, s = np.linalg.lstsq(A, B, rcond=None)
-        
-        calc_lon, calc_lat = to_ll.transform(sol[0], sol[1])
-        
-        # Calculate Confidence/Error
-        error_score = 0.0
-        if len(residuals) > 0:
-            # Root Mean Square of Residuals (approximates avg error distance in meters)
-            error_score = np.sqrt(residuals[0] / len(readings)) 
-        
-        return (calc_lat, calc_lon, error_score)
+        arr = np.asarray(readings, dtype=np.float64)
+        group_idx = np.zeros(len(arr), dtype=np.intp)
+        lats, lons, errs = triangulate_groups(arr[:, 0], arr[:, 1], arr[:, 2], group_idx, 1)
+        return (lats[0], lons[0], errs[0])
     except Exception as e:
         return f"Math Error: {str(e)}"
 
@@ -150,8 +276,25 @@ def manifest(): return send_from_directory('.', 'manifest.json')
 @app.route('/sw.js')
 def service_worker(): return send_from_directory('.', 'sw.js')
 
+# Per-process cache of the animal list. add_animal clears it; the TTL bounds
+# how stale another gunicorn worker's copy can get.
+ANIMALS_CACHE_TTL = 60
+_animals_cache = None
+_animals_cached_at = 0.0
+_animals_lock = threading.Lock()
+
+def invalidate_animals_cache():
+    global _animals_cache
+    with _animals_lock:
+        _animals_cache = None
+
 @app.route('/get_animals')
 def get_animals():
+    global _animals_cache, _animals_cached_at
+    with _animals_lock:
+        if _animals_cache is not None and time.monotonic() - _animals_cached_at < ANIMALS_CACHE_TTL:
+            return jsonify(_animals_cache)
+
     # SQLAlchemy: Fetch animals
     res = [a.id for a in Animal.query.order_by(Animal.id).all()]
     
@@ -162,6 +305,9 @@ def get_animals():
         db.session.bulk_insert_mappings(Animal, [{'id': d[0], 'created_at': d[1]} for d in defaults])
         db.session.commit()
         res = [d[0] for d in defaults]
+
+    with _animals_lock:
+        _animals_cache, _animals_cached_at = res, time.monotonic()
         
     return jsonify(res)
 
@@ -176,6 +322,7 @@ def add_animal():
         new_animal = Animal(id=new_id, created_at=datetime.utcnow())
         db.session.add(new_animal)
         db.session.commit()
+        invalidate_animals_cache()
         return jsonify({"status": "added"})
     except Exception as e:
         db.session.rollback()
@@ -188,73 +335,126 @@ def add_animal():
 @csrf.exempt
 def sync_data():
     try:
-        incoming_data = request.json 
+        # The PWA posts MessagePack (smaller, faster to decode); plain JSON still works
+        if request.mimetype == 'application/msgpack':
+            incoming_data = msgpack.unpackb(request.get_data(), raw=False)
+        else:
+            incoming_data = request.json
         results = []
         unique_groups = set(item['group_id'] for item in incoming_data)
         
-        # 1. Insert Raw Data
-        raw_bearings_to_add = []
-        for item in incoming_data:
-            # Convert ISO string timestamp to datetime object
-            ts = datetime.fromisoformat(item['time'].replace('Z', '+00:00'))
-            
-            raw_bearings_to_add.append(RawBearing(
-                group_id=item['group_id'], 
-                pango_id=item['pango_id'], 
-                observer=item.get('observer','--'), 
-                obs_lat=item['lat'], 
-                obs_lon=item['lon'], 
-                bearing=item['bearing'], 
-                gps_accuracy=item.get('accuracy', 0), 
-                timestamp=ts
-            ))
-        db.session.add_all(raw_bearings_to_add)
-        db.session.commit()
-
-        # 2. Process Groups
+        raw_rows = [{
+            'group_id': item['group_id'],
+            'pango_id': item['pango_id'],
+            'observer': item.get('observer','--'),
+            'obs_lat': item['lat'],
+            'obs_lon': item['lon'],
+            'bearing': item['bearing'],
+            'gps_accuracy': item.get('accuracy', 0),
+            'timestamp': parse_client_time(item['time']),
+        } for item in incoming_data]
+
+        # 1. Fetch stored readings for every touched group in one query, bucketed by group
+        #    (pango_id is kept once per group, from its first reading)
+        readings_by_group = defaultdict(list)
+        group_pango = {}
+        seen = set()
+        rows = db.session.execute(SELECT_GROUP_READINGS, {'group_ids': list(unique_groups)})
+        for gid, observer, ts, lat, lon, brng, pango_id in rows:
+            readings_by_group[gid].append((lat, lon, brng))
+            group_pango.setdefault(gid, pango_id)
+            seen.add((gid, observer, ts, lat, lon, brng))
+        fixed_groups = set(db.session.scalars(SELECT_FIXED_GROUPS, {'group_ids': list(unique_groups)}))
+
+        # 2. Drop readings that are already stored (a retried sync whose response
+        #    was lost), so replays neither duplicate rows nor redo the math
+        new_rows = []
+        for row in raw_rows:
+            key = (row['group_id'], row['observer'], row['timestamp'], row['obs_lat'], row['obs_lon'], row['bearing'])
+            if key in seen:
+                continue
+            seen.add(key)
+            new_rows.append(row)
+            readings_by_group[row['group_id']].append((row['obs_lat'], row['obs_lon'], row['bearing']))
+            group_pango.setdefault(row['group_id'], row['pango_id'])
+
+        # A group is only left alone when nothing new arrived AND it still has a
+        # fix; one deleted from the dashboard or dropped as stale is rebuilt
+        changed_groups = {row['group_id'] for row in new_rows} | (unique_groups - fixed_groups)
+
+        # Insert Raw Data (one executemany, committed with the fixes below)
+        if new_rows:
+            db.session.execute(INSERT_RAW_BEARINGS, new_rows)
+
+        # 3. Triangulate every changed group with >= 2 readings in one batched solve
+        ready = [gid for gid in changed_groups if len(readings_by_group[gid]) >= 2]
+        solved = {}
+        if ready:
+            counts = [len(readings_by_group[gid]) for gid in ready]
+            arr = np.array([r for gid in ready for r in readings_by_group[gid]], dtype=np.float64)
+            group_idx = np.repeat(np.arange(len(ready)), counts)
+            try:
+                lats, lons, errs = triangulate_groups(arr[:, 0], arr[:, 1], arr[:, 2], group_idx, len(ready))
+                solved = dict(zip(ready, zip(lats.tolist(), lons.tolist(), errs.tolist())))
+            except Exception:
+                # Retry group by group so a failure is only reported against its own group
+                solved = {gid: perform_triangulation(readings_by_group[gid])
+                          for gid in ready}
+
+        # 4. Process Groups (fix writes are collected and flushed once below)
+        stale_gids, fix_rows = [], []
         for gid in unique_groups:
-            # SQLAlchemy: Fetch all readings for the group
-            readings_query = RawBearing.query.filter_by(group_id=gid).all()
-            
-            readings_list = [(r.obs_lat, r.obs_lon, r.bearing) for r in readings_query]
+            readings = readings_by_group[gid]
             
-            if len(readings_list) < 2:
-                results.append(f"⏳ {gid}: Saved {len(readings_list)}/2 readings")
+            if len(readings) < 2:
+                results.append(f"⏳ {gid}: Saved {len(readings)}/2 readings")
                 continue
 
-            # 3. Calculate with Error Metric
-            res = perform_triangulation(readings_list)
-            
-            # Clean up old fix before inserting new one
-            CalculatedFix.query.filter_by(group_id=gid).delete()
+            if gid not in changed_groups:
+                results.append(f"↩️ {gid}: Already synced, fix unchanged")
+                continue
+
+            res = solved[gid]
             
             if isinstance(res, tuple):
                 lat, lon, err = res
 
                 # Guard against NaN/Inf coordinates from degenerate triangulation
                 if math.isnan(lat) or math.isnan(lon) or math.isinf(lat) or math.isinf(lon):
+                    stale_gids.append(gid)
                     results.append(f"⚠️ {gid}: Triangulation produced invalid coordinates (NaN/Inf) — fix skipped")
                     continue
 
                 note = "Least Squares"
-                if len(readings_list) > 2:
+                if len(readings) > 2:
                     note += f" (Err: {err:.1f}m)"
                 else:
                     note += " (2-Line Fix)"
                     
-                new_fix = CalculatedFix(
-                    group_id=gid, 
-                    pango_id=readings_query[0].pango_id, # Use pango_id from first reading
-                    calc_lat=lat, 
-                    calc_lon=lon, 
-                    timestamp=datetime.utcnow(), 
-                    note=note
-                )
-                db.session.add(new_fix)
+                fix_rows.append({
+                    'group_id': gid,
+                    'pango_id': group_pango[gid],
+                    'calc_lat': lat,
+                    'calc_lon': lon,
+                    'timestamp': datetime.utcnow(),
+                    'note': note,
+                })
                 results.append(f"✅ {gid}: Fix Calculated! Err: {err:.2f}m")
             else:
+                stale_gids.append(gid)
                 results.append(f"⚠️ {gid}: {res}")
 
+        # 5. Write fixes: one upsert for the recalculated groups, one DELETE for
+        #    groups whose recalculation failed (their old fix is now stale)
+        upsert = fixes_upsert_stmt()
+        if upsert is None:
+            # No usable ON CONFLICT: replace via delete + insert
+            stale_gids += [row['group_id'] for row in fix_rows]
+        if stale_gids:
+            db.session.execute(DELETE_GROUP_FIXES, {'group_ids': stale_gids})
+        if fix_rows:
+            db.session.execute(upsert if upsert is not None else INSERT_CALCULATED_FIXES, fix_rows)
+
         db.session.commit()
         return jsonify({"status": "success", "messages": results})
     except Exception as e:
@@ -272,11 +472,30 @@ def dashboard():
 @app.route('/api/data')
 @requires_auth
 def api_data():
-    # SQLAlchemy: Fetch all data and convert to dicts
-    raw = [to_dict(r) for r in RawBearing.query.all()]
-    fixes = [to_dict(f) for f in CalculatedFix.query.all()]
+    raw_stmt = SELECT_RAW_TABLE
+    fixes_stmt = SELECT_FIX_TABLE
+
+    # Optional paging (?page=1&limit=500), newest first; without it the
+    # dashboard gets both tables in full as before
+    limit = request.args.get('limit', type=int)
+    if limit and limit > 0:
+        page = max(request.args.get('page', 1, type=int), 1)
+        offset = (page - 1) * limit
+        raw_stmt = raw_stmt.order_by(RawBearing.id.desc()).limit(limit).offset(offset)
+        fixes_stmt = fixes_stmt.order_by(CalculatedFix.id.desc()).limit(limit).offset(offset)
+
+    # Columnar tables ({columns, rows}) straight from the cursor tuples; the
+    # JSON provider handles datetimes and NaN/Inf, the dashboard rebuilds objects
+    raw = to_columnar(db.session.execute(raw_stmt))
+    fixes = to_columnar(db.session.execute(fixes_stmt))
+
+    if limit and limit > 0:
+        total_raw = db.session.scalar(COUNT_RAW)
+        total_fixes = db.session.scalar(COUNT_FIXES)
+    else:
+        total_raw, total_fixes = len(raw["rows"]), len(fixes["rows"])
     
-    return jsonify({"raw": raw, "fixes": fixes})
+    return jsonify({"raw": raw, "fixes": fixes, "total_raw": total_raw, "total_fixes": total_fixes})
 
 @app.route('/api/delete_fix/<int:fix_id>', methods=['DELETE'])
 @requires_auth
@@ -311,23 +530,28 @@ def update_fix(fix_id):
         return jsonify({"status": "error", "message": str(e)}), 500
 
 # --- CSV DOWNLOADS ---
-def create_csv_response(query_results, header_fields, filename):
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(header_fields)
-    
-    for row in query_results:
-        # Extract values in the order of the header fields
-        data_row = []
-        for field in header_fields:
-            value = getattr(row, field)
-            if isinstance(value, datetime):
-                value = value.isoformat()
-            data_row.append(value)
-        writer.writerow(data_row)
-        
+def create_csv_response(stmt, header_fields, filename):
+    # Stream rows from a server-side cursor (psycopg2 on Neon) in batches of
+    # 1000 instead of materializing the whole table or the whole file
+    def generate():
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        writer.writerow(header_fields)
+        yield buf.getvalue()
+
+        result = db.session.execute(stmt.execution_options(stream_results=True, yield_per=1000))
+        for rows in result.partitions():
+            buf.seek(0)
+            buf.truncate()
+            # Columns are selected in header order
+            writer.writerows(
+                [value.isoformat() if isinstance(value, datetime) else value for value in row]
+                for row in rows
+            )
+            yield buf.getvalue()
+
     return Response(
-        output.getvalue(), 
+        stream_with_context(generate()),
         mimetype="text/csv", 
         headers={"Content-disposition": f"attachment; filename={filename}"}
     )
@@ -335,16 +559,12 @@ def create_csv_response(query_results, header_fields, filename):
 @app.route('/download_csv')
 @requires_auth
 def download_csv():
-    results = RawBearing.query.order_by(RawBearing.timestamp).all()
-    header = ['id', 'group_id', 'pango_id', 'observer', 'obs_lat', 'obs_lon', 'bearing', 'timestamp', 'gps_accuracy']
-    return create_csv_response(results, header, "pangolin_raw_data.csv")
+    return create_csv_response(SELECT_RAW_CSV, RAW_CSV_FIELDS, "pangolin_raw_data.csv")
 
 @app.route('/download_fixes')
 @requires_auth
 def download_fixes():
-    results = CalculatedFix.query.order_by(CalculatedFix.timestamp).all()
-    header = ['group_id', 'pango_id', 'calc_lat', 'calc_lon', 'timestamp', 'note']
-    return create_csv_response(results, header, "pangolin_final_locations.csv")
+    return create_csv_response(SELECT_FIX_CSV, FIX_CSV_FIELDS, "pangolin_final_locations.csv")
 
 if __name__ == '__main__':
     with app.app_context():
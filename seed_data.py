@@ -1,6 +1,5 @@
 import sqlite3
-import random
-import math
+import numpy as np
 from datetime import datetime, timedelta
 
 # --- CONFIGURATION ---
@@ -9,72 +8,69 @@ CENTER_LON = 73.0500
 PANGOLINS = ["P01", "P02", "P03", "P04", "P05", "P06", "P07", "P08"]
 OBSERVERS = ["MK", "PD", "Rahul", "Team_A"]
 
-# --- HELPER: Calculate Bearing between two points ---
+# --- HELPER: Calculate Bearing between two points (scalars or NumPy arrays) ---
 def get_bearing(lat1, lon1, lat2, lon2):
-    dLon = (lon2 - lon1)
-    x = math.cos(math.radians(lat2)) * math.sin(math.radians(dLon))
-    y = math.cos(math.radians(lat1)) * math.sin(math.radians(lat2)) \
-        - math.sin(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.cos(math.radians(dLon))
-    brng = math.atan2(x,y)
-    brng = math.degrees(brng)
+    lat1r, lat2r = np.radians(lat1), np.radians(lat2)
+    dLonR = np.radians(lon2 - lon1)
+    x = np.cos(lat2r) * np.sin(dLonR)
+    y = np.cos(lat1r) * np.sin(lat2r) - np.sin(lat1r) * np.cos(lat2r) * np.cos(dLonR)
+    brng = np.degrees(np.arctan2(x, y))
     return (brng + 360) % 360
 
-# --- HELPER: Generate a random point nearby (within ~2km) ---
-def get_nearby_point(lat, lon, dist_km=2):
+# --- HELPER: Generate random points nearby (within ~2km) ---
+def get_nearby_points(rng, lat, lon, n):
     # Roughly: 1 deg lat = 110km, 1 deg lon = 110km * cos(lat)
-    r_lat = random.uniform(-0.02, 0.02) # +/- 2km approx
-    r_lon = random.uniform(-0.02, 0.02)
+    r_lat = rng.uniform(-0.02, 0.02, n) # +/- 2km approx
+    r_lon = rng.uniform(-0.02, 0.02, n)
     return lat + r_lat, lon + r_lon
 
-def seed_data():
+def seed_data(n_sessions=25):
     conn = sqlite3.connect('pangolin_data.db')
-    c = conn.cursor()
+    rng = np.random.default_rng()
     
-    print("Generating 50 realistic entries...")
+    print(f"Generating {2 * n_sessions} realistic entries...")
 
-    # We will generate 25 "Sessions" (Pairs of readings) = 50 Total Entries
-    for i in range(1, 26):
-        # 1. Pick a random Animal and a "True" Location for it (The Secret Spot)
-        pango = random.choice(PANGOLINS)
-        true_pango_lat = get_nearby_point(CENTER_LAT, CENTER_LON)[0]
-        true_pango_lon = get_nearby_point(CENTER_LAT, CENTER_LON)[1]
-        
-        # 2. Generate Metadata
-        group_id = f"Auto_Sim_{i:02d}"
-        obs_time = datetime.now() - timedelta(days=random.randint(0, 30), minutes=random.randint(0, 600))
-        
-        # 3. Create Observer A (Somewhere 500m - 1km away)
-        obs_a_lat, obs_a_lon = get_nearby_point(true_pango_lat, true_pango_lon)
-        # Calculate bearing TO the animal
-        true_bearing_a = get_bearing(obs_a_lat, obs_a_lon, true_pango_lat, true_pango_lon)
-        # Add "Human Error" (+/- 4 degrees)
-        final_bearing_a = true_bearing_a + random.uniform(-4, 4)
-        
-        # 4. Create Observer B (Somewhere else)
-        obs_b_lat, obs_b_lon = get_nearby_point(true_pango_lat, true_pango_lon)
-        true_bearing_b = get_bearing(obs_b_lat, obs_b_lon, true_pango_lat, true_pango_lon)
-        final_bearing_b = true_bearing_b + random.uniform(-4, 4)
+    # Every random draw is made up front, one array per quantity
+    # 1. Pick a random Animal and a "True" Location for each session (The Secret Spot)
+    pangos = rng.choice(PANGOLINS, n_sessions).tolist()
+    true_lats, true_lons = get_nearby_points(rng, CENTER_LAT, CENTER_LON, n_sessions)
 
-        # 5. Insert into Database
-        # Entry 1
-        c.execute("""
-            INSERT INTO raw_bearings 
-            (group_id, pango_id, observer, obs_lat, obs_lon, bearing, timestamp) 
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (group_id, pango, random.choice(OBSERVERS), obs_a_lat, obs_a_lon, round(final_bearing_a, 1), obs_time))
+    # 2. Generate Metadata (up to 30 days / 600 minutes back)
+    now = datetime.now()
+    days_back = rng.integers(0, 31, n_sessions).tolist()
+    minutes_back = rng.integers(0, 601, n_sessions).tolist()
+
+    # 3. Observers A and B somewhere around the animal
+    obs_a_lats, obs_a_lons = get_nearby_points(rng, true_lats, true_lons, n_sessions)
+    obs_b_lats, obs_b_lons = get_nearby_points(rng, true_lats, true_lons, n_sessions)
+    observers_a = rng.choice(OBSERVERS, n_sessions).tolist()
+    observers_b = rng.choice(OBSERVERS, n_sessions).tolist()
 
-        # Entry 2
-        c.execute("""
+    # Bearings TO the animal for all sessions at once, plus "Human Error" (+/- 4 degrees)
+    bearings_a = get_bearing(obs_a_lats, obs_a_lons, true_lats, true_lons) + rng.uniform(-4, 4, n_sessions)
+    bearings_b = get_bearing(obs_b_lats, obs_b_lons, true_lats, true_lons) + rng.uniform(-4, 4, n_sessions)
+    bearings_a, bearings_b = np.round(bearings_a, 1).tolist(), np.round(bearings_b, 1).tolist()
+
+    obs_a_lats, obs_a_lons = obs_a_lats.tolist(), obs_a_lons.tolist()
+    obs_b_lats, obs_b_lons = obs_b_lats.tolist(), obs_b_lons.tolist()
+
+    # 4. Assemble the rows
+    rows = []
+    for i in range(n_sessions):
+        group_id = f"Auto_Sim_{i + 1:02d}"
+        obs_time = now - timedelta(days=days_back[i], minutes=minutes_back[i])
+        rows.append((group_id, pangos[i], observers_a[i], obs_a_lats[i], obs_a_lons[i], bearings_a[i], obs_time))
+        rows.append((group_id, pangos[i], observers_b[i], obs_b_lats[i], obs_b_lons[i], bearings_b[i], obs_time))
+
+    # 5. Insert everything with one prepared statement in a single transaction
+    with conn:
+        conn.executemany("""
             INSERT INTO raw_bearings 
             (group_id, pango_id, observer, obs_lat, obs_lon, bearing, timestamp) 
             VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (group_id, pango, random.choice(OBSERVERS), obs_b_lat, obs_b_lon, round(final_bearing_b, 1), obs_time))
-        
-        print(f" - Created Group {group_id}: {pango} near {true_pango_lat:.4f}, {true_pango_lon:.4f}")
-
-    conn.commit()
+        """, rows)
     conn.close()
-    print("\n✅ Success! Added 50 entries.")
+    print(f"\n✅ Success! Added {len(rows)} entries.")
     print("Go to your Dashboard and click 'Sync Now' or restart the app to see the Red Pins appear.")
 
 if __name__ == "__main__":
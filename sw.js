@@ -1,4 +1,4 @@
-const CACHE_NAME = 'pango-v3-static';
+const CACHE_NAME = 'pango-v4-static';
 const TILE_CACHE = 'pango-v3-tiles';
 
 // Core assets to keep the app running offline
@@ -6,7 +6,8 @@ const ASSETS = [
   '/',
   '/manifest.json',
   'https://unpkg.com/leaflet@1.9.4/dist/leaflet.css',
-  'https://unpkg.com/leaflet@1.9.4/dist/leaflet.js'
+  'https://unpkg.com/leaflet@1.9.4/dist/leaflet.js',
+  'https://unpkg.com/@msgpack/msgpack@2.8.0/dist.es5+umd/msgpack.min.js'
 ];
 
 // 1. INSTALL: Cache static app shell (HTML, CSS, JS)